@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Rebuild a ZIP from the previous release's ZIP and a delta made by release.py --delta.
+
+Download the .delta file and this script next to the ZIP you already have, then run:
+
+    python apply_delta.py rom.zip.from-axion-1.0-20250301.delta
+
+The base ZIP is looked up by the name recorded in the delta (use --base to
+point elsewhere), and both the base and the rebuilt ZIP are checked against
+the recorded SHA-256 digests.
+"""
+import argparse
+import hashlib
+import json
+import os
+import struct
+import sys
+import zlib
+from pathlib import Path
+
+# Must match DELTA_MAGIC in release.py
+MAGIC = b"PIPADLT1"
+
+# Bytes read at a time while copying and hashing
+BLOCK_SIZE = 16 * 1024 * 1024
+
+def read_header(delta):
+    """Read the JSON header from the end of a delta file. Returns (header, end of the literal stream)."""
+    size = delta.seek(0, os.SEEK_END)
+    trailer_size = 8 + len(MAGIC)
+    delta.seek(0)
+    if size < len(MAGIC) + trailer_size or delta.read(len(MAGIC)) != MAGIC:
+        raise ValueError("not a delta file")
+    delta.seek(size - trailer_size)
+    trailer = delta.read(trailer_size)
+    if trailer[8:] != MAGIC:
+        raise ValueError("delta file is truncated")
+    (header_size,) = struct.unpack("<Q", trailer[:8])
+    header_start = size - trailer_size - header_size
+    delta.seek(header_start)
+    return json.loads(delta.read(header_size)), header_start
+
+def hash_file(path):
+    """Return the SHA-256 hex digest of a file."""
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(BLOCK_SIZE), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+class LiteralStream:
+    """Reads the decompressed literal data of a delta in order."""
+    
+    def __init__(self, delta, end):
+        self.delta = delta
+        self.remaining = end - len(MAGIC)
+        self.decompressor = zlib.decompressobj()
+        self.buffer = b""
+        delta.seek(len(MAGIC))
+    
+    def read(self, size):
+        """Return exactly `size` bytes of literal data."""
+        while len(self.buffer) < size:
+            if self.decompressor.unconsumed_tail:
+                data = self.decompressor.unconsumed_tail
+            elif self.remaining:
+                data = self.delta.read(min(BLOCK_SIZE, self.remaining))
+                self.remaining -= len(data)
+            else:
+                raise ValueError("delta literal data ends early")
+            self.buffer += self.decompressor.decompress(data, BLOCK_SIZE)
+        data, self.buffer = self.buffer[:size], self.buffer[size:]
+        return data
+
+def apply_delta(delta_path, base_path=None, output_path=None):
+    """Rebuild the target ZIP of a delta and verify it. Returns an exit code."""
+    delta_path = Path(delta_path)
+    try:
+        delta = open(delta_path, "rb")
+    except OSError as e:
+        print(f"Error: Could not open {delta_path}: {e}")
+        return 1
+    with delta:
+        try:
+            header, literal_end = read_header(delta)
+        except (OSError, ValueError) as e:
+            print(f"Error: {delta_path.name}: {e}")
+            return 1
+    
+        base = Path(base_path) if base_path else delta_path.parent / header["base"]["name"]
+        target = header["target"]
+        output = Path(output_path) if output_path else delta_path.parent / target["name"]
+        print(f"Rebuilding {target['name']} from {base.name}...")
+        if not base.exists():
+            print(f"  ✗ {base}: missing, download the previous release's ZIP first")
+            return 1
+        if base.stat().st_size != header["base"]["size"] or hash_file(base) != header["base"]["sha256"]:
+            print(f"  ✗ {base.name} is not the ZIP this delta was made from")
+            return 1
+    
+        # Write to a temporary name so an interrupted run never leaves a truncated file behind
+        temp_output = output.with_name(f"{output.name}.partial")
+        hasher = hashlib.sha256()
+        literals = LiteralStream(delta, literal_end)
+        try:
+            with open(base, "rb") as source, open(temp_output, "wb") as out:
+                for op in header["ops"]:
+                    if op[0] == "c":
+                        source.seek(op[1])
+                        remaining = op[2]
+                        while remaining:
+                            block = source.read(min(BLOCK_SIZE, remaining))
+                            if not block:
+                                raise ValueError(f"{base.name} is shorter than the delta expects")
+                            remaining -= len(block)
+                            hasher.update(block)
+                            out.write(block)
+                    else:
+                        remaining = op[1]
+                        while remaining:
+                            block = literals.read(min(BLOCK_SIZE, remaining))
+                            remaining -= len(block)
+                            hasher.update(block)
+                            out.write(block)
+        except (OSError, ValueError, zlib.error) as e:
+            temp_output.unlink(missing_ok=True)
+            print(f"  ✗ {delta_path.name}: {e}")
+            return 1
+    
+    if hasher.hexdigest() != target["sha256"]:
+        temp_output.unlink()
+        print(f"  ✗ {target['name']}: SHA-256 of the rebuilt file differs from the delta")
+        return 1
+    os.replace(temp_output, output)
+    print(f"  ✓ {target['name']} rebuilt ({target['size']} bytes, sha256 {target['sha256']})")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild a ZIP from its previous release and a release.py delta")
+    parser.add_argument("deltas", nargs="*", help="Delta files (default: all *.delta here)")
+    parser.add_argument("--base", help="ZIP the delta was made from (default: the name recorded in the delta)")
+    parser.add_argument("-o", "--output", help="Where to write the rebuilt ZIP (default: its original name)")
+    args = parser.parse_args()
+    
+    deltas = args.deltas or sorted(str(path) for path in Path(".").glob("*.delta"))
+    if not deltas:
+        print("Error: No .delta files found")
+        return 1
+    if len(deltas) > 1 and (args.base or args.output):
+        print("Error: --base and --output need a single delta file")
+        return 1
+    
+    exit_code = 0
+    for delta in deltas:
+        exit_code |= apply_delta(delta, args.base, args.output)
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())
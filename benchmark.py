@@ -0,0 +1,638 @@
+#!/usr/bin/env python3
+"""Benchmark release.py against a local mock of the GitHub release API.
+
+Generates synthetic ROM artifacts, starts a mock release API with a shared
+bandwidth limit, per-request latency and injected upload failures, and runs
+release.py for every combination of artifact size, backend, concurrency and
+part size. The gh backend runs against a fake `gh` that forwards to the mock.
+Each run reports end-to-end time, CPU use, peak RSS and the error of the
+progress display's ETA. Everything is seeded, so runs on one machine are
+comparable:
+
+    python benchmark.py --sizes 10M,100M,1G --jobs 1,4 --output bench.json
+    python benchmark.py --baseline bench.json     # fails if a run got slower
+
+Needs Linux or macOS (the progress display is read through a pseudo-terminal).
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import shlex
+import shutil
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from release import format_size, parse_size
+
+RELEASE_SCRIPT = Path(__file__).resolve().parent / "release.py"
+
+# Repository the mock API serves
+BENCH_REPO = "bench/rom"
+
+# Build date in the artifact names, so release.py extracts the tag bench-1.0-20250101
+BENCH_ZIP_NAME = "bench-1.0-20250101-BENCH-pipa.zip"
+BENCH_IMG_NAME = "boot.img"
+
+# Bytes generated and received at a time
+BLOCK_SIZE = 1024 * 1024
+
+# Longest burst the bandwidth limit lets through, in seconds of bandwidth
+LINK_BURST = 0.05
+
+# Progress between these percentages is used for the ETA error; the ends are mostly rounding
+ETA_SAMPLE_RANGE = (5.0, 95.0)
+
+# Overall progress line of release.py's upload display
+OVERALL_LINE = re.compile(r"Overall: \[[^\]]*\]\s*([\d.]+)% .*?ETA: ~?((?:\d+[hms] ?)+)")
+
+# Stand-in for the GitHub CLI that forwards the commands release.py uses to the mock API
+GH_SHIM = '''
+import http.client, json, os, sys
+from urllib.parse import quote, urlsplit
+
+API = os.environ["BENCH_API_URL"]
+REPO = os.environ["GH_REPO"]
+
+def request(method, url, body=None, headers=None):
+    parts = urlsplit(url if url.startswith("http") else f"{API}/{url}")
+    connection = http.client.HTTPConnection(parts.netloc, timeout=600, blocksize=1024 * 1024)
+    connection.request(method, parts.path + (f"?{parts.query}" if parts.query else ""), body=body,
+                       headers=headers or {})
+    response = connection.getresponse()
+    data = response.read()
+    connection.close()
+    return response.status, data
+
+def get_release(tag):
+    status, data = request("GET", f"repos/{REPO}/releases/tags/{quote(tag, safe='')}")
+    return json.loads(data) if status == 200 else None
+
+def fail(message):
+    print(message, file=sys.stderr)
+    sys.exit(1)
+
+args = sys.argv[1:]
+if args[:2] == ["auth", "token"]:
+    print("bench-token")
+elif args[:1] == ["api"]:
+    path = next(arg for arg in args[1:] if arg.startswith("repos/")).replace("{owner}/{repo}", REPO)
+    if "--paginate" in args:
+        page, items = 1, []
+        while True:
+            status, data = request("GET", f"{path}&page={page}")
+            if status != 200 or not json.loads(data):
+                break
+            items += json.loads(data)
+            page += 1
+        for item in items:
+            print(item["tag_name"])
+    else:
+        status, data = request("GET", path)
+        if status != 200:
+            fail(f"HTTP {status}")
+        print(data.decode())
+elif args[:2] == ["release", "view"]:
+    sys.exit(0 if get_release(args[2]) else 1)
+elif args[:2] == ["release", "create"]:
+    payload = {"tag_name": args[2], "name": args[args.index("--title") + 1], "body": args[args.index("--notes") + 1]}
+    status, data = request("POST", f"repos/{REPO}/releases", json.dumps(payload).encode())
+    if status != 201:
+        fail(f"HTTP {status}: {data.decode()}")
+    print(json.loads(data)["html_url"])
+elif args[:2] == ["release", "upload"]:
+    release = get_release(args[2]) or fail(f"release not found: {args[2]}")
+    path = args[3]
+    name = os.path.basename(path)
+    existing = [asset for asset in release["assets"] if asset["name"] == name]
+    if existing and "--clobber" in args:
+        request("DELETE", f"repos/{REPO}/releases/assets/{existing[0]['id']}")
+    url = release["upload_url"].split("{", 1)[0] + "?name=" + quote(name)
+    try:
+        with open(path, "rb") as f:
+            status, data = request("POST", url, f, {"Content-Length": str(os.path.getsize(path))})
+    except OSError as e:
+        fail(f"upload failed: {e}")
+    if status != 201:
+        fail(f"HTTP {status}: {data.decode()}")
+elif args[:2] == ["release", "delete-asset"]:
+    release = get_release(args[2]) or fail(f"release not found: {args[2]}")
+    for asset in release["assets"]:
+        if asset["name"] == args[3]:
+            request("DELETE", f"repos/{REPO}/releases/assets/{asset['id']}")
+            sys.exit(0)
+    fail(f"asset not found: {args[3]}")
+else:
+    fail(f"unsupported gh command: {' '.join(args)}")
+'''
+
+class Link:
+    """Token bucket shared by all uploads, simulating one uplink of `rate` bytes per second."""
+    
+    def __init__(self, rate):
+        self.rate = rate
+        self.lock = threading.Lock()
+        self.available = 0.0
+        self.last = time.monotonic()
+    
+    def consume(self, amount):
+        """Wait until `amount` bytes fit through the link."""
+        if not self.rate:
+            return
+        with self.lock:
+            now = time.monotonic()
+            self.available = min(self.rate * LINK_BURST, self.available + (now - self.last) * self.rate)
+            self.last = now
+            self.available -= amount
+            wait = -self.available / self.rate
+        if wait > 0:
+            time.sleep(wait)
+
+class MockReleaseHandler(BaseHTTPRequestHandler):
+    """The GitHub release API endpoints used by release.py, backed by MockReleaseServer's state."""
+    
+    protocol_version = "HTTP/1.1"
+    
+    def log_message(self, *args):
+        pass
+    
+    def send(self, status, payload=None, headers=()):
+        body = b"" if payload is None else json.dumps(payload).encode()
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def handle_one_request(self):
+        # Every request pays the round trip, like a request to a distant API would
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        super().handle_one_request()
+    
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        prefix = f"/repos/{BENCH_REPO}/releases"
+        if url.path == prefix:
+            per_page = int(query.get("per_page", ["30"])[0])
+            page = int(query.get("page", ["1"])[0])
+            with self.server.lock:
+                releases = list(self.server.releases.values())
+            headers = []
+            if page * per_page < len(releases):
+                next_url = f"{self.server.url}{prefix}?per_page={per_page}&page={page + 1}"
+                headers.append(("Link", f'<{next_url}>; rel="next"'))
+            return self.send(200, [self.server.describe(release) for release in
+                                   releases[(page - 1) * per_page:page * per_page]], headers)
+        if url.path.startswith(prefix + "/tags/"):
+            with self.server.lock:
+                release = self.server.releases.get(unquote(url.path[len(prefix + "/tags/"):]))
+            if release is None:
+                return self.send(404, {"message": "Not Found"})
+            return self.send(200, self.server.describe(release))
+        self.send(404, {"message": "Not Found"})
+    
+    def do_POST(self):
+        url = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length", "0"))
+        if url.path == f"/repos/{BENCH_REPO}/releases":
+            payload = json.loads(self.rfile.read(length))
+            with self.server.lock:
+                if payload["tag_name"] in self.server.releases:
+                    return self.send(422, {"message": "already_exists"})
+                release = self.server.releases[payload["tag_name"]] = {
+                    "id": self.server.next_id(), "tag_name": payload["tag_name"], "name": payload.get("name"),
+                    "body": payload.get("body"), "assets": [],
+                }
+            return self.send(201, self.server.describe(release))
+        match = re.fullmatch(rf"/uploads/repos/{BENCH_REPO}/releases/(\d+)/assets", url.path)
+        if match:
+            return self.receive_asset(int(match.group(1)), parse_qs(url.query)["name"][0], length)
+        self.send(404, {"message": "Not Found"})
+    
+    def receive_asset(self, release_id, name, length):
+        """Read an uploaded asset through the simulated link, failing some uploads on purpose."""
+        failure = self.server.pick_failure()
+        drop_at = int(length * self.server.random_fraction()) if failure == "drop" else None
+        hasher = hashlib.sha256()
+        received = 0
+        while received < length:
+            if drop_at is not None and received >= drop_at:
+                # Connection lost in the middle of the upload
+                self.close_connection = True
+                self.server.count("failures")
+                return
+            data = self.rfile.read(min(BLOCK_SIZE, length - received))
+            if not data:
+                return
+            self.server.link.consume(len(data))
+            hasher.update(data)
+            received += len(data)
+            self.server.count("bytes", len(data))
+        if failure == "error":
+            self.server.count("failures")
+            return self.send(502, {"message": "Bad Gateway"})
+    
+        with self.server.lock:
+            release = next((release for release in self.server.releases.values() if release["id"] == release_id),
+                           None)
+            if release is None:
+                return self.send(404, {"message": "Not Found"})
+            if any(asset["name"] == name for asset in release["assets"]):
+                return self.send(422, {"message": "already_exists"})
+            asset = {"id": self.server.next_id(), "name": name, "size": received, "state": "uploaded",
+                     "digest": f"sha256:{hasher.hexdigest()}"}
+            release["assets"].append(asset)
+        self.server.count("assets")
+        self.send(201, asset)
+    
+    def do_DELETE(self):
+        match = re.fullmatch(rf"/repos/{BENCH_REPO}/releases/assets/(\d+)", urlsplit(self.path).path)
+        if match:
+            with self.server.lock:
+                for release in self.server.releases.values():
+                    release["assets"] = [asset for asset in release["assets"] if asset["id"] != int(match.group(1))]
+            self.send_response(204)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send(404, {"message": "Not Found"})
+
+class MockReleaseServer(ThreadingHTTPServer):
+    """Local mock of the GitHub release API with configurable bandwidth, latency and failures."""
+    
+    daemon_threads = True
+    
+    def __init__(self, bandwidth=0, latency=0.0, fail_rate=0.0, seed=1):
+        super().__init__(("127.0.0.1", 0), MockReleaseHandler)
+        self.url = f"http://127.0.0.1:{self.server_address[1]}"
+        self.link = Link(bandwidth)
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.seed = seed
+        self.lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        """Forget all releases and counters before the next run."""
+        with self.lock:
+            self.releases = {}
+            self.last_id = 0
+            self.random = random.Random(self.seed)
+            self.stats = {"bytes": 0, "assets": 0, "failures": 0}
+    
+    def next_id(self):
+        self.last_id += 1
+        return self.last_id
+    
+    def describe(self, release):
+        """Release as returned by the API, with its upload URL."""
+        return dict(release, upload_url=f"{self.url}/uploads/repos/{BENCH_REPO}/releases/{release['id']}/assets"
+                                        "{?name,label}",
+                    html_url=f"{self.url}/{BENCH_REPO}/releases/tag/{release['tag_name']}")
+    
+    def pick_failure(self):
+        """Decide whether an upload fails: None, "drop" (connection lost) or "error" (HTTP 502)."""
+        with self.lock:
+            if self.random.random() >= self.fail_rate:
+                return None
+            return self.random.choice(["drop", "error"])
+    
+    def random_fraction(self):
+        with self.lock:
+            return self.random.random()
+    
+    def count(self, key, amount=1):
+        with self.lock:
+            self.stats[key] += amount
+
+def write_random(f, size, rng, zero_every=0):
+    """Write `size` seeded random bytes, with every `zero_every`-th block zeroed if set."""
+    block_number = 0
+    while size > 0:
+        length = min(BLOCK_SIZE, size)
+        if zero_every and block_number % zero_every == zero_every - 1:
+            f.write(bytes(length))
+        else:
+            f.write(rng.randbytes(length))
+        size -= length
+        block_number += 1
+
+def make_artifacts(directory, size, seed):
+    """Create an OTA-like ZIP of about `size` bytes and an IMG a quarter of that, unless already there.
+    
+    The ZIP stores a random payload.bin, like a real OTA package. Half of the
+    IMG is zeros, so --sparse and --compress have something to do.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    marker = directory / "artifacts.json"
+    settings = {"size": size, "seed": seed}
+    try:
+        if json.loads(marker.read_text()) == settings:
+            return
+    except (OSError, ValueError):
+        pass
+    
+    print(f"Generating {format_size(size)} of test artifacts in {directory}...", flush=True)
+    rng = random.Random(seed)
+    with zipfile.ZipFile(directory / BENCH_ZIP_NAME, "w") as archive:
+        archive.writestr("META-INF/com/android/metadata", "ota-type=AB\npre-device=pipa\n" * 20,
+                         zipfile.ZIP_DEFLATED)
+        archive.writestr("payload_properties.txt", "FILE_HASH=bench\nFILE_SIZE=0\n")
+        with archive.open(zipfile.ZipInfo("payload.bin"), "w", force_zip64=True) as payload:
+            write_random(payload, max(size - 4096, 0), rng)
+    img_size = max(size // 4 // 4096 * 4096, 4096)
+    with open(directory / BENCH_IMG_NAME, "wb") as img:
+        write_random(img, img_size, rng, zero_every=2)
+    marker.write_text(json.dumps(settings))
+
+def install_gh_shim(directory):
+    """Write the fake `gh` into `directory` and return the directory."""
+    directory.mkdir(parents=True, exist_ok=True)
+    shim = directory / "gh"
+    shim.write_text(f"#!{sys.executable}\n{GH_SHIM}")
+    shim.chmod(0o755)
+    return directory
+
+def parse_eta(text):
+    """Parse a time printed by release.py (e.g. "1m 5s") into seconds."""
+    units = {"h": 3600, "m": 60, "s": 1}
+    return sum(int(value) * units[unit] for value, unit in re.findall(r"(\d+)([hms])", text))
+
+def run_release(command, cwd, env):
+    """Run release.py on a pseudo-terminal so that it draws its progress display.
+    
+    Returns (exit code, seconds, resource usage, [(seconds, percent, eta)], output).
+    """
+    import pty  # Not available on Windows
+    master, slave = pty.openpty()
+    start = time.monotonic()
+    process = subprocess.Popen(command, cwd=cwd, env=env, stdin=subprocess.DEVNULL, stdout=slave, stderr=slave,
+                               close_fds=True)
+    os.close(slave)
+    samples = []
+    output = []
+    pending = ""
+    while True:
+        try:
+            data = os.read(master, 65536)
+        except OSError:
+            break  # The terminal closes when release.py exits
+        if not data:
+            break
+        now = time.monotonic() - start
+        text = pending + data.decode("utf-8", errors="replace")
+        lines = re.split(r"[\r\n]", text)
+        pending = lines.pop()
+        for line in lines:
+            output.append(line)
+            match = OVERALL_LINE.search(line)
+            if match:
+                samples.append((now, float(match.group(1)), parse_eta(match.group(2))))
+    os.close(master)
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.monotonic() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+    return process.returncode, elapsed, usage, samples, output
+
+def get_eta_error(samples, elapsed):
+    """Mean and largest error of the predicted finish time, as fractions of the actual run time."""
+    errors = [abs(now + eta - elapsed) / elapsed for now, percent, eta in samples
+              if ETA_SAMPLE_RANGE[0] <= percent <= ETA_SAMPLE_RANGE[1]]
+    if not errors or elapsed <= 0:
+        return None, None
+    return statistics.mean(errors), max(errors)
+
+def summarize_trace(path):
+    """Total seconds per phase and the number of upload retries from a --trace file."""
+    phases = {}
+    retries = 0
+    try:
+        lines = Path(path).read_text().splitlines()
+    except OSError:
+        return phases, retries
+    for line in lines:
+        span = json.loads(line)
+        phases[span["span"]] = round(phases.get(span["span"], 0) + span["duration"], 6)
+        if span["span"] == "upload":
+            retries += span.get("retries", 0)
+    return phases, retries
+
+def benchmark(server, artifacts, work_dir, name, backend, jobs, part_size, release_args):
+    """Run one release of the artifacts in a fresh directory and return its measurements."""
+    run_dir = work_dir / "runs" / name
+    shutil.rmtree(run_dir, ignore_errors=True)
+    (run_dir / "home").mkdir(parents=True)
+    files = [artifacts / BENCH_ZIP_NAME, artifacts / BENCH_IMG_NAME]
+    for file in files:
+        try:
+            os.link(file, run_dir / file.name)
+        except OSError:
+            shutil.copyfile(file, run_dir / file.name)
+    
+    server.reset()
+    trace = run_dir / "trace.jsonl"
+    command = [sys.executable, str(RELEASE_SCRIPT), "-a", "-y", "-b", backend, "-j", str(jobs), "--trace",
+               str(trace)]
+    if backend == "http":
+        command += ["--api-url", server.url]
+    if part_size:
+        command += ["--max-asset-size", str(part_size)]
+    command += release_args
+    env = dict(os.environ, GH_TOKEN="bench-token", GH_REPO=BENCH_REPO, BENCH_API_URL=server.url,
+               # A fresh home directory keeps the throughput history of other runs out of the estimates
+               HOME=str(run_dir / "home"), PATH=f"{work_dir / 'bin'}{os.pathsep}{os.environ.get('PATH', '')}")
+    env.pop("GITHUB_API_URL", None)
+    
+    exit_code, elapsed, usage, samples, output = run_release(command, run_dir, env)
+    phases, retries = summarize_trace(trace)
+    size = sum(file.stat().st_size for file in files)
+    eta_error, eta_error_max = get_eta_error(samples, elapsed)
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak_rss = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+    result = {
+        "name": name,
+        "backend": backend,
+        "jobs": jobs,
+        "part_size": part_size,
+        "exit_code": exit_code,
+        "seconds": round(elapsed, 3),
+        "bytes": size,
+        "throughput": round(size / elapsed) if elapsed > 0 else None,
+        "cpu_user": round(usage.ru_utime, 3),
+        "cpu_system": round(usage.ru_stime, 3),
+        "cpu_percent": round((usage.ru_utime + usage.ru_stime) / elapsed * 100, 1) if elapsed > 0 else None,
+        "peak_rss": peak_rss,
+        "server_bytes": server.stats["bytes"],
+        "failures_injected": server.stats["failures"],
+        "retries": retries,
+        "eta_error": round(eta_error, 4) if eta_error is not None else None,
+        "eta_error_max": round(eta_error_max, 4) if eta_error_max is not None else None,
+        "eta_samples": len(samples),
+        "phases": phases,
+    }
+    if exit_code != 0:
+        result["output_tail"] = [line for line in output if line.strip()][-10:]
+    shutil.rmtree(run_dir, ignore_errors=True)
+    return result
+
+def print_results(runs):
+    """Print one line per run."""
+    print(f"\n{'Run':<32} {'Exit':>4} {'Time':>9} {'Throughput':>12} {'CPU':>6} {'Peak RSS':>10} "
+          f"{'ETA err':>8} {'Retries':>7}")
+    for run in runs:
+        eta = f"{run['eta_error']:.0%}" if run["eta_error"] is not None else "-"
+        throughput = f"{format_size(run['throughput'])}/s" if run["throughput"] else "-"
+        print(f"{run['name']:<32} {run['exit_code']:>4} {run['seconds']:>8.2f}s {throughput:>12} "
+              f"{run['cpu_percent']:>5.0f}% {format_size(run['peak_rss']):>10} {eta:>8} {run['retries']:>7}")
+
+def compare_with_baseline(runs, settings, baseline_path, max_regression):
+    """Compare median run times with a baseline results file. Returns True if none regressed too much."""
+    try:
+        baseline = json.loads(Path(baseline_path).read_text())
+    except (OSError, ValueError) as e:
+        print(f"Error: Could not read baseline {baseline_path}: {e}")
+        return False
+    if baseline.get("settings") != settings:
+        print(f"\nWarning: {baseline_path} was run with other settings: {baseline.get('settings')}")
+    
+    def medians(results):
+        times = {}
+        for run in results:
+            if run["exit_code"] == 0:
+                times.setdefault(run["config"], []).append(run["seconds"])
+        return {config: statistics.median(values) for config, values in times.items()}
+    
+    before = medians(baseline.get("runs", []))
+    after = medians(runs)
+    print(f"\n{'Compared with ' + str(baseline_path):<40} {'Before':>9} {'After':>9} {'Change':>8}")
+    ok = True
+    for config, seconds in after.items():
+        if config not in before:
+            print(f"{config:<40} {'-':>9} {seconds:>8.2f}s {'new':>8}")
+            continue
+        change = (seconds - before[config]) / before[config] * 100
+        flag = ""
+        if change > max_regression:
+            flag = " ✗"
+            ok = False
+        print(f"{config:<40} {before[config]:>8.2f}s {seconds:>8.2f}s {change:>+7.1f}%{flag}")
+    return ok
+
+def parse_list(text, convert=str):
+    return [convert(item.strip()) for item in text.split(",") if item.strip()]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark release.py against a local mock GitHub release API")
+    parser.add_argument("--sizes", default="10M,100M",
+                        help="ZIP sizes to benchmark, each with an IMG a quarter of its size (default: 10M,100M)")
+    parser.add_argument("--backends", default="http,gh", help="Backends to run (default: http,gh)")
+    parser.add_argument("--jobs", default="1,4", help="Concurrent uploads to run with (default: 1,4)")
+    parser.add_argument("--part-sizes", default="default",
+                        help="--max-asset-size values to run with, 'default' for release.py's own (default: default)")
+    parser.add_argument("--release-args", default="",
+                        help="Extra release.py options for every run (e.g. --release-args=\"--sparse -c zstd\")")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs of every combination (default: 1)")
+    parser.add_argument("--bandwidth", type=parse_size, default=parse_size("100M"),
+                        help="Upload bandwidth of the mock server per second, shared by all uploads (default: 100M)")
+    parser.add_argument("--unlimited", action="store_true", help="Do not limit the upload bandwidth")
+    parser.add_argument("--latency", type=float, default=0.02,
+                        help="Seconds added to every request to the mock server (default: 0.02)")
+    parser.add_argument("--fail-rate", type=float, default=0.0,
+                        help="Fraction of uploads that fail, half by a dropped connection and half with HTTP 502 "
+                             "(default: 0)")
+    parser.add_argument("--seed", type=int, default=1, help="Seed of the artifacts and failures (default: 1)")
+    parser.add_argument("--work-dir", default=".bench", help="Directory for artifacts and runs (default: .bench)")
+    parser.add_argument("-o", "--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Compare median times with an earlier --output file")
+    parser.add_argument("--max-regression", type=float, default=10.0,
+                        help="Percent slower than the baseline that fails the benchmark (default: 10)")
+    args = parser.parse_args()
+    
+    if os.name == "nt":
+        print("Error: The benchmark needs a pseudo-terminal and runs on Linux and macOS only")
+        return 1
+    try:
+        sizes = parse_list(args.sizes, parse_size)
+        part_sizes = [None if part == "default" else parse_size(part) for part in parse_list(args.part_sizes)]
+        jobs = parse_list(args.jobs, int)
+    except (argparse.ArgumentTypeError, ValueError) as e:
+        parser.error(str(e))
+    backends = parse_list(args.backends)
+    if any(backend not in ("gh", "http") for backend in backends):
+        parser.error("--backends takes gh and http")
+    
+    work_dir = Path(args.work_dir).resolve()
+    install_gh_shim(work_dir / "bin")
+    server = MockReleaseServer(0 if args.unlimited else args.bandwidth, args.latency, args.fail_rate, args.seed)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Mock release API at {server.url}: "
+          f"{'unlimited' if args.unlimited else format_size(args.bandwidth) + '/s'}, "
+          f"{args.latency * 1000:g} ms latency, {args.fail_rate:.0%} failed uploads")
+    
+    runs = []
+    try:
+        for size in sizes:
+            artifacts = work_dir / "artifacts" / format_size(size).replace(" ", "")
+            make_artifacts(artifacts, size, args.seed)
+            for backend in backends:
+                for job_count in jobs:
+                    for part_size in part_sizes:
+                        config = f"{format_size(size).replace(' ', '')}-{backend}-j{job_count}"
+                        if part_size:
+                            config += f"-p{format_size(part_size).replace(' ', '')}"
+                        for repeat in range(args.repeat):
+                            name = config if args.repeat == 1 else f"{config}#{repeat + 1}"
+                            print(f"Running {name}...", flush=True)
+                            result = benchmark(server, artifacts, work_dir, name, backend, job_count, part_size,
+                                               shlex.split(args.release_args))
+                            result.update(config=config, size=size, repeat=repeat + 1)
+                            runs.append(result)
+    except KeyboardInterrupt:
+        print("\nInterrupted; reporting the finished runs")
+    finally:
+        server.shutdown()
+    
+    print_results(runs)
+    failed = [run["name"] for run in runs if run["exit_code"] != 0]
+    for run in runs:
+        if run["exit_code"] != 0:
+            print(f"\n{run['name']} failed:")
+            for line in run.get("output_tail", []):
+                print(f"  {line}")
+    
+    settings = {
+        "bandwidth": 0 if args.unlimited else args.bandwidth,
+        "latency": args.latency,
+        "fail_rate": args.fail_rate,
+        "seed": args.seed,
+        "release_args": args.release_args,
+    }
+    if args.output:
+        Path(args.output).write_text(json.dumps({
+            "version": 1,
+            "python": sys.version.split()[0],
+            "platform": sys.platform,
+            "settings": settings,
+            "runs": runs,
+        }, indent=2))
+        print(f"\nResults written to {args.output}")
+    
+    if args.baseline and not compare_with_baseline(runs, settings, args.baseline, args.max_regression):
+        return 1
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Reassemble a file that release.py split into parts, verifying every part and the result.
+
+Download the parts, the .manifest.json file and this script into one directory, then run:
+
+    python reassemble.py rom.zip.manifest.json
+
+Without arguments every *.manifest.json in the current directory is processed.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+# Bytes read at a time while copying and hashing
+BLOCK_SIZE = 16 * 1024 * 1024
+
+def hash_part(path):
+    """Return the SHA-256 hex digest of a part file."""
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(BLOCK_SIZE), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+def verify_parts(manifest, directory):
+    """Check that every part exists with the recorded size and digest. Returns a list of problems."""
+    problems = []
+    for part in manifest["parts"]:
+        path = directory / part["name"]
+        if not path.exists():
+            problems.append(f"{part['name']}: missing")
+        elif path.stat().st_size != part["size"]:
+            problems.append(f"{part['name']}: size {path.stat().st_size}, expected {part['size']}")
+        elif hash_part(path) != part["sha256"]:
+            problems.append(f"{part['name']}: SHA-256 digest differs")
+    return problems
+
+def reassemble(manifest_path, verify_only=False, keep_parts=True):
+    """Verify the parts of a manifest and join them into the original file. Returns an exit code."""
+    manifest_path = Path(manifest_path)
+    directory = manifest_path.parent
+    try:
+        manifest = json.loads(manifest_path.read_text())
+    except (OSError, ValueError) as e:
+        print(f"Error: Could not read manifest {manifest_path}: {e}")
+        return 1
+    
+    name = os.path.basename(manifest["name"])
+    print(f"Checking {len(manifest['parts'])} parts of {name}...")
+    problems = verify_parts(manifest, directory)
+    if problems:
+        for problem in problems:
+            print(f"  ✗ {problem}")
+        return 1
+    if verify_only:
+        print(f"  ✓ All parts of {name} are intact")
+        return 0
+    
+    # Write to a temporary name so an interrupted run never leaves a truncated file behind
+    output = directory / name
+    temp_output = directory / f"{name}.partial"
+    hasher = hashlib.sha256()
+    with open(temp_output, "wb") as target:
+        for part in manifest["parts"]:
+            with open(directory / part["name"], "rb") as source:
+                for block in iter(lambda: source.read(BLOCK_SIZE), b""):
+                    hasher.update(block)
+                    target.write(block)
+    
+    if hasher.hexdigest() != manifest["sha256"]:
+        temp_output.unlink()
+        print(f"  ✗ {name}: SHA-256 of the reassembled file differs from the manifest")
+        return 1
+    os.replace(temp_output, output)
+    print(f"  ✓ {name} reassembled ({manifest['size']} bytes, sha256 {manifest['sha256']})")
+    
+    if not keep_parts:
+        for part in manifest["parts"]:
+            (directory / part["name"]).unlink()
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Reassemble and verify files split by release.py")
+    parser.add_argument("manifests", nargs="*", help="Manifest files (default: all *.manifest.json here)")
+    parser.add_argument("-c", "--check", action="store_true", help="Only verify the parts, do not reassemble")
+    parser.add_argument("--delete-parts", action="store_true", help="Delete the parts after reassembling")
+    args = parser.parse_args()
+    
+    manifests = args.manifests or sorted(str(path) for path in Path(".").glob("*.manifest.json"))
+    if not manifests:
+        print("Error: No .manifest.json files found")
+        return 1
+    
+    exit_code = 0
+    for manifest in manifests:
+        exit_code |= reassemble(manifest, verify_only=args.check, keep_parts=not args.delete_parts)
+    return exit_code
+
+if __name__ == "__main__":
+    sys.exit(main())